@@ -1,14 +1,24 @@
+import asyncio
+import functools
+import io
 import os
 import json
 import tempfile
+import threading
+import time
 import traceback
 import datetime
 import pathlib
-from typing import Optional
-
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form, Request, Depends
-from fastapi.responses import FileResponse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form, Request, Response, Depends
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+import orjson
 from pydantic import BaseModel, EmailStr
 import jwt
 import hashlib
@@ -26,7 +36,7 @@ from .models import (
     EvidenceItem,
     EventItem,
 )
-from .utils import sha256_file
+from .utils import TTLCache, sha256_file
 from .engine import (
     tool_versions,
     detect_media_type,
@@ -40,14 +50,43 @@ from .engine import (
     metadata_consistency,
     metadata_completeness,
 )
-from .report import build_pdf_report
-from . import workspace
+from .report import build_pdf_report, render_pdf_bytes
+from . import engine, workspace
 
 
 # -----------------------------
 # App / CORS
 # -----------------------------
-app = FastAPI()
+# orjson serializes the large metadata/ffprobe payloads several times faster
+# than stdlib json and emits bytes directly.
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Upload limit in bytes, computed once; _too_big runs per streamed chunk.
+_MAX_UPLOAD_BYTES = MAX_MB * 1024 * 1024
+
+_UPLOAD_PATHS = frozenset({"/analyze", "/report"})
+
+
+def _too_big(nbytes: int) -> bool:
+    return nbytes > _MAX_UPLOAD_BYTES
+
+
+# Registered before CORS below so the CORS middleware wraps it and the
+# early 413 still carries Access-Control-Allow-Origin for browser clients.
+@app.middleware("http")
+async def _content_length_guard(request: Request, call_next):
+    """Fail fast on the declared Content-Length before the body is parsed.
+
+    The multipart envelope adds a little overhead, so this only fires on
+    requests that cannot possibly fit; the streaming check in _spool_upload
+    still catches clients that understate the header or use chunked encoding.
+    """
+    if request.method == "POST" and request.url.path in _UPLOAD_PATHS:
+        cl = request.headers.get("content-length")
+        if cl and cl.isdigit() and _too_big(int(cl)):
+            return ORJSONResponse({"detail": f"File too large. Max {MAX_MB} MB."}, status_code=413)
+    return await call_next(request)
+
 
 _origins_raw = os.getenv(
     "CORS_ORIGINS",
@@ -66,6 +105,46 @@ app.add_middleware(
 
 workspace.init_db()
 
+
+@app.on_event("startup")
+def _start_exiftool_daemon():
+    engine.exiftool_daemon.start()
+
+
+@app.on_event("shutdown")
+def _stop_exiftool_daemon():
+    engine.exiftool_daemon.stop()
+
+
+# ReportLab rendering is CPU-bound, so concurrent /report calls serialize on
+# the GIL in a thread. A small process pool renders across cores instead;
+# the thread path stays as fallback if the pool dies or never started.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+@app.on_event("startup")
+def _start_pdf_pool():
+    global _pdf_pool
+    _pdf_pool = ProcessPoolExecutor(max_workers=min(2, os.cpu_count() or 1))
+
+
+@app.on_event("shutdown")
+def _stop_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+async def _render_pdf(analysis_dict: Dict[str, Any]) -> bytes:
+    if _pdf_pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_pdf_pool, render_pdf_bytes, analysis_dict)
+        except BrokenProcessPool:
+            pass
+    return await asyncio.to_thread(render_pdf_bytes, analysis_dict)
+
+
 # -----------------------------
 # Auth (PBKDF2-HMAC-SHA256)
 # -----------------------------
@@ -116,8 +195,28 @@ def _create_token(user_id: str, email: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
 
 
+# Short-TTL caches so chatty authenticated clients (case polling) don't pay
+# HMAC verification plus a user SELECT on every request. TTL stays well under
+# token lifetime; worst case a just-expired token or deleted user lingers for
+# a few seconds.
+_TOKEN_CACHE = TTLCache(maxsize=4096, ttl=10)
+_USER_CACHE = TTLCache(maxsize=4096, ttl=10)
+
+
 def _decode_token(token: str) -> dict:
-    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
+    payload = _TOKEN_CACHE.get(token)
+    if payload is None:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
+        _TOKEN_CACHE.put(token, payload)
+    return payload
+
+
+def _get_user_cached(user_id: str) -> Optional[dict]:
+    u = _USER_CACHE.get(user_id)
+    if u is None:
+        u = workspace.get_user(user_id)
+        _USER_CACHE.put(user_id, u)
+    return u
 
 
 def get_current_user(request: Request) -> dict:
@@ -132,7 +231,7 @@ def get_current_user(request: Request) -> dict:
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
-    u = workspace.get_user(user_id)
+    u = _get_user_cached(user_id)
     if not u:
         raise HTTPException(status_code=401, detail="User not found")
     return u
@@ -149,19 +248,20 @@ def get_optional_user(request: Request) -> Optional[dict]:
         user_id = payload.get("sub")
         if not user_id:
             return None
-        return workspace.get_user(user_id)
+        return _get_user_cached(user_id)
     except Exception:
         return None
 
 
 @app.post("/auth/register", response_model=AuthOut)
-def register(payload: AuthIn):
+async def register(payload: AuthIn):
     existing = workspace.get_user_by_email(payload.email)
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
     if len(payload.password) < 8:
         raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
-    ph = _hash_password(payload.password)
+    # PBKDF2 at 200k iterations is ~100ms of CPU; keep it off the event loop.
+    ph = await asyncio.to_thread(_hash_password, payload.password)
     try:
         u = workspace.create_user(payload.email, ph)
     except sqlite3.IntegrityError:
@@ -172,17 +272,33 @@ def register(payload: AuthIn):
 
 
 @app.post("/auth/login", response_model=AuthOut)
-def login(payload: AuthIn):
+async def login(payload: AuthIn):
     u = workspace.get_user_by_email(payload.email)
-    if not u or not _verify_password(payload.password, u.get("password_hash") or ""):
+    ok = bool(u) and await asyncio.to_thread(_verify_password, payload.password, u.get("password_hash") or "")
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = _create_token(u["id"], u["email"])
     return {"token": token, "user": {"id": u["id"], "email": u["email"]}}
 
 
+def _etag_json(request: Request, payload: Any) -> Response:
+    """JSON response with a weak ETag; returns 304 when the client is current.
+
+    The UI polls these endpoints, so skipping the body (and the client-side
+    re-render) on unchanged data is the cheap win; Cache-Control keeps
+    intermediaries out of it.
+    """
+    body = orjson.dumps(payload)
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/auth/me")
-def me(user=Depends(get_current_user)):
-    return {"id": user["id"], "email": user["email"]}
+def me(request: Request, user=Depends(get_current_user)):
+    return _etag_json(request, {"id": user["id"], "email": user["email"]})
 
 
 # -----------------------------
@@ -193,77 +309,236 @@ def health():
     return {"ok": True, "service": "truthstamp-api"}
 
 
-def _too_big(nbytes: int) -> bool:
-    return nbytes > MAX_MB * 1024 * 1024
-
-
 def _cleanup_file(path: Optional[str]) -> None:
     if not path:
         return
+    # Single unlink syscall; the old exists()+remove() pair was both slower
+    # and a TOCTOU race.
     try:
-        if os.path.exists(path):
-            os.remove(path)
-    except Exception:
+        os.unlink(path)
+    except FileNotFoundError:
         pass
+    except OSError:
+        pass
+
+
+UPLOAD_CHUNK_BYTES = 1 << 20  # 1 MiB
+
+
+async def _spool_upload(file: UploadFile, dst_path: str) -> tuple[int, str]:
+    """Stream an upload to dst_path in chunks, hashing as we go.
+
+    Returns (nbytes, sha256_hex). Raises 413 as soon as the size limit is
+    exceeded, so oversized uploads never get fully buffered or written.
+    """
+    h = hashlib.sha256()
+    total = 0
+    with open(dst_path, "wb") as out:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            if _too_big(total):
+                raise HTTPException(status_code=413, detail=f"File too large. Max {MAX_MB} MB.")
+            h.update(chunk)
+            out.write(chunk)
+    return total, h.hexdigest()
 
 
 # -----------------------------
 # Analysis Core
 # -----------------------------
+# Static report boilerplate — identical for every analysis, so build the
+# string literals once instead of re-allocating them per request.
+_WHAT_THIS_REPORT_IS = (
+    "Cryptographic provenance verification when present (C2PA)",
+    "Structured technical observations (metadata, encoding, workflow hints)",
+    "Clear separation of provable facts, derived observations, and unknowns",
+)
+_WHAT_THIS_REPORT_IS_NOT = (
+    "A probability score of being fake",
+    "A determination of authenticity or intent",
+    "A detector of specific deepfake models",
+)
+_WHAT_WOULD_MAKE_VERIFIABLE = (
+    "Capture from a C2PA-enabled camera/app",
+    "Preserve the original file without re-export or platform recompression",
+    "Seal media at capture inside a trusted app or device workflow",
+)
+_DECISION_CONTEXT = {
+    "purpose": "Support financial, legal, or editorial decision-making without guessing.",
+    "principle": "Separates provable facts, technical observations, and unknowns.",
+}
+
+# Alias preference order for the EXIF fields surfaced in summaries/findings.
+_MAKE_KEYS = ("EXIF:Make", "Make")
+_MODEL_KEYS = ("EXIF:Model", "Model")
+_SOFTWARE_KEYS = ("EXIF:Software", "XMP:CreatorTool", "Software")
+
+
+def _meta_first(meta: Dict[str, Any], keys: tuple) -> Any:
+    """First truthy value among the given alias keys (single lookup each)."""
+    for k in keys:
+        v = meta.get(k)
+        if v:
+            return v
+    return None
+
+
+# report_integrity timestamps have minute resolution, so re-formatting at
+# most every 30s is lossless.
+_ts_cache = {"t": 0.0, "s": ""}
+
+
+def _report_timestamp() -> str:
+    now = time.time()
+    if now - _ts_cache["t"] > 30:
+        _ts_cache["s"] = f"{datetime.datetime.now(datetime.timezone.utc):%Y-%m-%d %H:%M} UTC"
+        _ts_cache["t"] = now
+    return _ts_cache["s"]
+
+
+@functools.lru_cache(maxsize=1)
+def _tool_status() -> "tuple[list[ToolStatus], Dict[str, Dict[str, Any]]]":
+    """ToolStatus models + report_integrity summary, built once per process.
+
+    tool_versions() is already memoized, so the derived Pydantic objects are
+    immutable for the process lifetime too; responses only read them.
+    """
+    tool_list = []
+    tools_summary = {}
+    for k, v in (tool_versions() or {}).items():
+        vd = v if isinstance(v, dict) else {}
+        ts = ToolStatus(name=k, available=vd.get("available", False), version=vd.get("version"), notes=vd.get("notes"))
+        tool_list.append(ts)
+        tools_summary[k] = {"available": ts.available, "version": ts.version}
+    return tool_list, tools_summary
+
+
+# Shared pool for the external extraction tools (subprocess-bound work).
+_extract_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="extract")
+
+# Extraction results keyed by file SHA-256 (TTL + LRU bound). Duplicate
+# uploads — typically JSON analysis followed by a PDF of the same file —
+# skip the exiftool/ffprobe/c2patool spawns entirely.
+_EXTRACT_CACHE_MAX = int(os.getenv("TRUTHSTAMP_EXTRACT_CACHE_MAX", "512"))
+_EXTRACT_CACHE_TTL = int(os.getenv("TRUTHSTAMP_EXTRACT_CACHE_TTL_S", "600"))
+_extract_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_extract_cache_lock = threading.Lock()
+
+
+def _extract_cache_get(sha: str) -> Optional[Dict[str, Any]]:
+    with _extract_cache_lock:
+        item = _extract_cache.get(sha)
+        if not item:
+            return None
+        ts, val = item
+        if time.monotonic() - ts > _EXTRACT_CACHE_TTL:
+            del _extract_cache[sha]
+            return None
+        _extract_cache.move_to_end(sha)
+        return val
+
+
+def _extract_cache_put(sha: str, val: Dict[str, Any]) -> None:
+    with _extract_cache_lock:
+        _extract_cache[sha] = (time.monotonic(), val)
+        _extract_cache.move_to_end(sha)
+        while len(_extract_cache) > _EXTRACT_CACHE_MAX:
+            _extract_cache.popitem(last=False)
+
+
+def _extract_all(in_path: str, sha: str) -> Dict[str, Any]:
+    """Run (or replay) the tool extraction for a file identified by its SHA-256."""
+    cached = _extract_cache_get(sha)
+    if cached is not None:
+        return cached
+
+    media_type = detect_media_type(in_path)
+
+    # The three extractors have no data dependency, so run them in parallel:
+    # wall time becomes the slowest tool instead of the sum of all three.
+    # "unknown" here means extension, magic bytes, and ffprobe's own format
+    # probe all failed to place the file, so a second ffprobe run is wasted;
+    # exiftool still runs since it reads XMP/EXIF from many document formats.
+    meta_f = _extract_pool.submit(extract_exiftool, in_path) if media_type in {"image", "video", "unknown"} else None
+    ff_f = _extract_pool.submit(extract_ffprobe, in_path) if media_type == "video" else None
+    c2pa_f = _extract_pool.submit(extract_c2pa, in_path)
+
+    # Each extractor bounds its own subprocess at 25s; the extra margin here
+    # covers pool queueing. A join that still expires marks the tool as timed
+    # out instead of blocking the request indefinitely.
+    def _join(fut):
+        if fut is None:
+            return {}
+        try:
+            return fut.result(timeout=30)
+        except FuturesTimeoutError:
+            fut.cancel()
+            return {"_status": "timeout"}
+
+    meta = _join(meta_f)
+    ff = _join(ff_f)
+    c2pa = _join(c2pa_f)
+
+    # Normalize to dicts once here so every consumer downstream can index
+    # without re-checking types on the hot path.
+    out = {
+        "media_type": media_type,
+        "meta": meta if isinstance(meta, dict) else {},
+        "ff": ff if isinstance(ff, dict) else {},
+        "c2pa": c2pa if isinstance(c2pa, dict) else {},
+    }
+    # Don't cache a timed-out extraction; a retry may succeed once the pool
+    # recovers, and a cached partial result would stick for the full TTL.
+    if not any(d.get("_status") == "timeout" for d in (out["meta"], out["ff"], out["c2pa"])):
+        _extract_cache_put(sha, out)
+    return out
+
+
 def _analyze_to_model(
     in_path: str,
     filename: Optional[str],
     role: Optional[str],
     use_case: Optional[str],
     bytes_len: int,
-    case_id: Optional[str] = None,
-    actor: str = "web",
-    request: Optional[Request] = None,
-    evidence_id: Optional[str] = None,
+    sha: Optional[str] = None,
 ) -> AnalysisResult:
-    sha = sha256_file(in_path)
-    media_type = detect_media_type(in_path)
-    tools = tool_versions() or {}
-
-    meta = extract_exiftool(in_path) if media_type in {"image", "video", "unknown"} else {}
-    ff = extract_ffprobe(in_path) if media_type in {"video", "unknown"} else {}
-    c2pa = extract_c2pa(in_path)
-
-    meta_d = meta if isinstance(meta, dict) else {}
-    ff_d = ff if isinstance(ff, dict) else {}
-
-    ai = ai_disclosure_from_metadata(meta_d)
-    trans = transformation_hints(meta_d, ff_d)
-    tl = derived_timeline(meta_d)
-    cons = metadata_consistency(meta_d)
-    prov_state, prov_summary = classify_provenance(c2pa, meta_d)
-
-    make = meta_d.get("EXIF:Make") or meta_d.get("Make")
-    model = meta_d.get("EXIF:Model") or meta_d.get("Model")
-    sw = meta_d.get("EXIF:Software") or meta_d.get("XMP:CreatorTool") or meta_d.get("Software")
+    # The endpoints hash while spooling the upload; fall back for direct callers.
+    sha = sha or sha256_file(in_path)
+    tool_list, tools_summary = _tool_status()
+
+    # _extract_all already normalized meta/ff/c2pa to dicts.
+    extracted = _extract_all(in_path, sha)
+    media_type = extracted["media_type"]
+    meta = extracted["meta"]
+    ff = extracted["ff"]
+    c2pa = extracted["c2pa"]
+
+    ai = ai_disclosure_from_metadata(meta)
+    trans = transformation_hints(meta, ff)
+    tl = derived_timeline(meta)
+    cons = metadata_consistency(meta)
+    mc = metadata_completeness(meta)
+    prov_state, prov_summary = classify_provenance(c2pa, meta)
+
+    make = _meta_first(meta, _MAKE_KEYS)
+    model = _meta_first(meta, _MODEL_KEYS)
+    sw = _meta_first(meta, _SOFTWARE_KEYS)
 
     extra = []
     if make or model:
         extra.append(f"Device metadata suggests capture on: {(make or '').strip()} {(model or '').strip()}".strip())
     if sw:
         extra.append(f"Software/creator tool tag: {sw}")
-    if isinstance(ai, dict) and ai.get("declared") == "POSSIBLE":
+    if ai.get("declared") == "POSSIBLE":
         extra.append(f"AI-related markers present in metadata: {', '.join((ai.get('signals') or [])[:6])}")
-    if isinstance(trans, dict) and trans.get("screenshot_likelihood") == "HIGH":
+    if trans.get("screenshot_likelihood") == "HIGH":
         extra.append("Workflow hints suggest possible screenshot/screen capture.")
 
     summary = prov_summary + (" " + " ".join(extra) if extra else "")
 
-    tool_list = [
-        ToolStatus(
-            name=k,
-            available=v.get("available", False) if isinstance(v, dict) else False,
-            version=v.get("version") if isinstance(v, dict) else None,
-            notes=v.get("notes") if isinstance(v, dict) else None,
-        )
-        for k, v in tools.items()
-    ]
-
     findings = [
         Finding(
             key="provenance_state",
@@ -277,7 +552,9 @@ def _analyze_to_model(
     else:
         findings.append(Finding(key="device_make_model", value=None, confidence="UNKNOWN", notes="No camera Make/Model metadata found."))
 
-    return AnalysisResult(
+    # Values here are internal constructions, not client input, so skip
+    # re-validation and build the model directly.
+    return AnalysisResult.model_construct(
         filename=filename or "upload",
         role=role,
         use_case=use_case,
@@ -288,35 +565,20 @@ def _analyze_to_model(
         summary=summary,
         tools=tool_list,
         c2pa=c2pa,
-        metadata=meta_d,
-        ffprobe=ff_d,
+        metadata=meta,
+        ffprobe=ff,
         ai_disclosure=ai,
         transformations=trans,
         derived_timeline=tl,
         metadata_consistency=cons,
-        metadata_completeness=metadata_completeness(meta_d),
-        what_this_report_is=[
-            "Cryptographic provenance verification when present (C2PA)",
-            "Structured technical observations (metadata, encoding, workflow hints)",
-            "Clear separation of provable facts, derived observations, and unknowns",
-        ],
-        what_this_report_is_not=[
-            "A probability score of being fake",
-            "A determination of authenticity or intent",
-            "A detector of specific deepfake models",
-        ],
-        decision_context={
-            "purpose": "Support financial, legal, or editorial decision-making without guessing.",
-            "principle": "Separates provable facts, technical observations, and unknowns.",
-        },
-        what_would_make_verifiable=[
-            "Capture from a C2PA-enabled camera/app",
-            "Preserve the original file without re-export or platform recompression",
-            "Seal media at capture inside a trusted app or device workflow",
-        ],
+        metadata_completeness=mc,
+        what_this_report_is=list(_WHAT_THIS_REPORT_IS),
+        what_this_report_is_not=list(_WHAT_THIS_REPORT_IS_NOT),
+        decision_context=dict(_DECISION_CONTEXT),
+        what_would_make_verifiable=list(_WHAT_WOULD_MAKE_VERIFIABLE),
         report_integrity={
-            "timestamp": datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"),
-            "tools": {t.name: {"available": t.available, "version": t.version} for t in tool_list},
+            "timestamp": _report_timestamp(),
+            "tools": tools_summary,
         },
         findings=findings,
     )
@@ -339,17 +601,28 @@ def create_case(payload: CaseCreate, request: Request, user=Depends(get_current_
     return c
 
 
+def _case_item(row: dict) -> dict:
+    """Project a workspace case row to the CaseItem response shape.
+
+    Returning a raw Response from _etag_json bypasses response_model
+    filtering, so the projection has to happen before the body is built —
+    otherwise internal columns like user_id leak into the payload.
+    """
+    return CaseItem.model_validate(row).model_dump(mode="json")
+
+
 @app.get("/cases", response_model=list[CaseItem])
-def list_cases(limit: int = 50, offset: int = 0, user=Depends(get_current_user)):
-    return workspace.list_cases(user["id"], limit=limit, offset=offset)
+def list_cases(request: Request, limit: int = 50, offset: int = 0, user=Depends(get_current_user)):
+    rows = workspace.list_cases(user["id"], limit=limit, offset=offset)
+    return _etag_json(request, [_case_item(c) for c in rows])
 
 
 @app.get("/cases/{case_id}", response_model=CaseItem)
-def get_case(case_id: str, user=Depends(get_current_user)):
+def get_case(request: Request, case_id: str, user=Depends(get_current_user)):
     c = workspace.get_case(user["id"], case_id)
     if not c:
         raise HTTPException(status_code=404, detail="Case not found")
-    return c
+    return _etag_json(request, _case_item(c))
 
 
 @app.get("/cases/{case_id}/evidence", response_model=list[EvidenceItem])
@@ -376,22 +649,52 @@ def list_case_events(case_id: str, limit: int = 200, user=Depends(get_current_us
     return workspace.list_events(case_id, limit=limit)
 
 
+def _persist_evidence(
+    case_id: str,
+    evidence_id: str,
+    event_type: str,
+    actor: Optional[str],
+    ip: Optional[str],
+    user_agent: Optional[str],
+    analysis: Dict[str, Any],
+) -> None:
+    """Write the evidence row and its chain-of-custody event.
+
+    Runs as a background task so clients don't wait on SQLite fsyncs;
+    the evidence id is pre-allocated so the response can reference it.
+    Both rows go in a single transaction.
+    """
+    workspace.add_evidence_with_event(
+        case_id=case_id,
+        filename=analysis.get("filename") or "upload",
+        sha256=analysis.get("sha256") or "",
+        media_type=analysis.get("media_type"),
+        nbytes=analysis.get("bytes") or 0,
+        provenance_state=analysis.get("provenance_state"),
+        summary=analysis.get("summary"),
+        analysis=analysis,
+        event_type=event_type,
+        actor=actor,
+        ip=ip,
+        user_agent=user_agent,
+        details={"filename": analysis.get("filename"), "sha256": analysis.get("sha256")},
+        evidence_id=evidence_id,
+    )
+
+
 # -----------------------------
 # Analysis (public) & Report (login required)
 # -----------------------------
 @app.post("/analyze", response_model=AnalysisResult)
 async def analyze(
     request: Request,
+    background_tasks: BackgroundTasks,
     user: Optional[dict] = Depends(get_optional_user),
     file: UploadFile = File(...),
     role: str | None = Form(default=None),
     use_case: str | None = Form(default=None),
     case_id: str | None = Form(default=None),
 ):
-    contents = await file.read()
-    if _too_big(len(contents)):
-        raise HTTPException(status_code=413, detail=f"File too large. Max {MAX_MB} MB.")
-
     # If caller isn't logged in, ignore case_id (guest single-file analysis).
     if not user:
         case_id = None
@@ -402,33 +705,37 @@ async def analyze(
 
     with tempfile.TemporaryDirectory() as td:
         in_path = os.path.join(td, file.filename or "upload.bin")
-        with open(in_path, "wb") as f:
-            f.write(contents)
+        nbytes, sha = await _spool_upload(file, in_path)
 
-        res = _analyze_to_model(in_path, file.filename, role, use_case, bytes_len=len(contents))
+        # _analyze_to_model is sync and blocks on subprocess joins for up to
+        # ~30s; run it off the event loop so other requests keep being served.
+        res = await asyncio.to_thread(
+            _analyze_to_model, in_path, file.filename, role, use_case, bytes_len=nbytes, sha=sha
+        )
 
         if case_id and user:
-            evd = workspace.add_evidence(
-                case_id=case_id,
-                filename=file.filename or "upload",
-                sha256=res.sha256,
-                media_type=res.media_type,
-                nbytes=len(contents),
-                provenance_state=res.provenance_state,
-                summary=res.summary,
-                analysis=res.model_dump(),
-            )
-            workspace.add_event(
+            res.case_id = case_id
+            res.evidence_id = workspace.new_evidence_id()
+
+        # Dump once: the same dict feeds the evidence row and the response,
+        # instead of a second full-tree walk during response serialization.
+        # mode="json" produces JSON-ready values in a single core pass and
+        # exclude_none drops null-only keys the UI treats as absent anyway.
+        dump = res.model_dump(mode="json", exclude_none=True)
+
+        if case_id and user:
+            background_tasks.add_task(
+                _persist_evidence,
                 case_id,
+                res.evidence_id,
                 "evidence.analyzed",
-                evidence_id=evd["id"],
-                actor=user["email"],
-                ip=request.client.host if request.client else None,
-                user_agent=request.headers.get("user-agent"),
-                details={"filename": file.filename, "sha256": res.sha256},
+                user["email"],
+                request.client.host if request.client else None,
+                request.headers.get("user-agent"),
+                dump,
             )
 
-        return res
+        return ORJSONResponse(dump, background=background_tasks)
 
 
 @app.post("/report")
@@ -442,64 +749,59 @@ async def report(
     case_id: str | None = Form(default=None),
 ):
     tmp_in = None
-    tmp_pdf = None
 
     try:
-        contents = await file.read()
-        if _too_big(len(contents)):
-            raise HTTPException(status_code=413, detail=f"File too large. Max {MAX_MB} MB.")
-
         if case_id and not workspace.get_case(user["id"], case_id):
             raise HTTPException(status_code=404, detail="Case not found")
 
         suffix = os.path.splitext(file.filename or "")[-1] or ".bin"
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
             tmp_in = f.name
-            f.write(contents)
+        nbytes, sha = await _spool_upload(file, tmp_in)
 
-        analysis_model = _analyze_to_model(tmp_in, file.filename, role, use_case, bytes_len=len(contents))
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as pf:
-            tmp_pdf = pf.name
+        # Off-loop for the same reason as /analyze: the subprocess joins
+        # inside can take tens of seconds and must not stall the event loop.
+        analysis_model = await asyncio.to_thread(
+            _analyze_to_model, tmp_in, file.filename, role, use_case, bytes_len=nbytes, sha=sha
+        )
+        # Dump once; the PDF renderer and the evidence row share the same dict
+        # rather than each walking the full model (metadata/ffprobe included).
+        analysis_dict = analysis_model.model_dump(mode="json", exclude_none=True)
 
-        build_pdf_report(analysis_model.model_dump(), tmp_pdf)
+        # Render straight into memory — reports are small, and this avoids a
+        # temp-file write, a read-back, and the cleanup lifetime entirely.
+        pdf_bytes = await _render_pdf(analysis_dict)
 
         if case_id:
-            evd = workspace.add_evidence(
-                case_id=case_id,
-                filename=file.filename or "upload",
-                sha256=analysis_model.sha256,
-                media_type=analysis_model.media_type,
-                nbytes=len(contents),
-                provenance_state=analysis_model.provenance_state,
-                summary=analysis_model.summary,
-                analysis=analysis_model.model_dump(),
-            )
-            workspace.add_event(
+            evidence_id = workspace.new_evidence_id()
+            background_tasks.add_task(
+                _persist_evidence,
                 case_id,
+                evidence_id,
                 "report.generated",
-                evidence_id=evd["id"],
-                actor=user["email"],
-                ip=request.client.host if request.client else None,
-                user_agent=request.headers.get("user-agent"),
-                details={"filename": file.filename, "sha256": analysis_model.sha256},
+                user["email"],
+                request.client.host if request.client else None,
+                request.headers.get("user-agent"),
+                analysis_dict,
             )
 
         background_tasks.add_task(_cleanup_file, tmp_in)
-        background_tasks.add_task(_cleanup_file, tmp_pdf)
 
-        return FileResponse(tmp_pdf, media_type="application/pdf", filename="truthstamp-report.pdf")
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="truthstamp-report.pdf"'},
+            background=background_tasks,
+        )
 
     except HTTPException:
         background_tasks.add_task(_cleanup_file, tmp_in)
-        background_tasks.add_task(_cleanup_file, tmp_pdf)
         raise
 
     except Exception as e:
         print("REPORT_GENERATION_ERROR:", repr(e))
         print(traceback.format_exc())
         background_tasks.add_task(_cleanup_file, tmp_in)
-        background_tasks.add_task(_cleanup_file, tmp_pdf)
         raise HTTPException(status_code=500, detail="Report generation failed. See API logs.")
 
 
@@ -511,6 +813,92 @@ class LeadIn(BaseModel):
     notes: str | None = None
 
 
+LEADS_DIR = pathlib.Path(os.getenv("TRUTHSTAMP_LEADS_DIR", "/tmp/truthstamp"))
+LEADS_PATH = LEADS_DIR / "leads.jsonl"
+LEAD_FLUSH_MAX_LINES = 64
+LEAD_FLUSH_IDLE_S = 1.0
+# Cap on lines kept in memory for retry after a failed write; beyond this
+# the oldest lines are dropped rather than growing without bound.
+LEAD_RETRY_MAX_LINES = 1024
+
+LEADS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _write_lead_lines(lines: list[str]) -> None:
+    try:
+        with LEADS_PATH.open("a", encoding="utf-8") as f:
+            f.writelines(lines)
+    except FileNotFoundError:
+        # Directory vanished (ephemeral /tmp); recreate once and retry.
+        LEADS_DIR.mkdir(parents=True, exist_ok=True)
+        with LEADS_PATH.open("a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+
+async def _lead_writer(q: "asyncio.Queue[str]") -> None:
+    """Drain the lead queue in batches so /lead never touches the filesystem.
+
+    Batches up to LEAD_FLUSH_MAX_LINES lines, or whatever has arrived after
+    LEAD_FLUSH_IDLE_S of quiet; remaining lines are flushed on shutdown.
+    A failed write must not end the loop: the batch is retried with the next
+    flush (bounded by LEAD_RETRY_MAX_LINES) so a transient disk error does
+    not turn into permanent silent data loss.
+    """
+    pending: list[str] = []
+    while True:
+        lines = [await q.get()]
+        try:
+            while len(lines) < LEAD_FLUSH_MAX_LINES:
+                lines.append(await asyncio.wait_for(q.get(), timeout=LEAD_FLUSH_IDLE_S))
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            try:
+                _write_lead_lines(pending + lines)
+            except Exception as e:
+                print("LEAD_WRITE_ERROR:", repr(e))
+            raise
+        if pending:
+            lines = pending + lines
+            pending = []
+        try:
+            await asyncio.to_thread(_write_lead_lines, lines)
+        except Exception as e:
+            print("LEAD_WRITE_ERROR:", repr(e))
+            pending = lines[-LEAD_RETRY_MAX_LINES:]
+
+
+@app.on_event("startup")
+async def _start_lead_writer():
+    app.state.lead_q = asyncio.Queue()
+    app.state.lead_task = asyncio.create_task(_lead_writer(app.state.lead_q))
+
+
+@app.on_event("shutdown")
+async def _stop_lead_writer():
+    task = getattr(app.state, "lead_task", None)
+    q = getattr(app.state, "lead_q", None)
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # A writer that already died with a stored exception must not
+            # abort shutdown; the queue drain below still has to run.
+            print("LEAD_WRITER_ERROR:", repr(e))
+    if q:
+        leftover = []
+        while not q.empty():
+            leftover.append(q.get_nowait())
+        if leftover:
+            try:
+                _write_lead_lines(leftover)
+            except Exception as e:
+                print("LEAD_WRITE_ERROR:", repr(e))
+
+
 @app.post("/lead")
 async def lead(payload: LeadIn):
     try:
@@ -519,12 +907,9 @@ async def lead(payload: LeadIn):
             "role": payload.role,
             "use_case": payload.use_case,
             "notes": payload.notes,
-            "received_at": datetime.datetime.utcnow().isoformat() + "Z",
+            "received_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
         }
-        out_dir = pathlib.Path("/tmp/truthstamp")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        with (out_dir / "leads.jsonl").open("a", encoding="utf-8") as f:
-            f.write(json.dumps(line) + "\n")
+        await app.state.lead_q.put(orjson.dumps(line).decode() + "\n")
         return {"ok": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Any, Dict, List, Optional, Literal
 
 ProvenanceState = Literal[
@@ -25,6 +25,10 @@ class Finding(BaseModel):
 
 
 class AnalysisResult(BaseModel):
+    # Built only from trusted internal values; keep the validator on its
+    # fast path (no extra-field bookkeeping, no assignment re-validation).
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     # Core file info
     filename: str
     media_type: str
@@ -1,26 +1,75 @@
 from __future__ import annotations
 
+import copy
 import datetime
+import functools
 import hashlib
+import io
 import json
+import time
 from typing import Any, Dict, List, Tuple
 
+import orjson
+
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.enums import TA_LEFT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import LongTable, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+
+# Styles are fixed for every report; build them once at import instead of
+# re-deriving the stylesheet (which deep-copies parents) per PDF.
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle("ts_title", parent=_STYLES["Heading1"], fontName="Helvetica-Bold", fontSize=18, leading=22, alignment=TA_LEFT)
+_H2_STYLE = ParagraphStyle("ts_h2", parent=_STYLES["Heading2"], fontName="Helvetica-Bold", fontSize=12, leading=14, alignment=TA_LEFT)
+_BODY_STYLE = ParagraphStyle("ts_body", parent=_STYLES["BodyText"], fontName="Helvetica", fontSize=10, leading=13, alignment=TA_LEFT)
+_SMALL_STYLE = ParagraphStyle("ts_small", parent=_STYLES["BodyText"], fontName="Helvetica", fontSize=9, leading=12, alignment=TA_LEFT)
+
+_KV_TABLE_STYLE = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("ROWBACKGROUNDS", (0, 0), (-1, -1), [colors.whitesmoke, colors.white]),
+        ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ("LEFTPADDING", (0, 0), (-1, -1), 6),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]
+)
+
+
+# Headings and other fixed lines are identical in every report; build each
+# Paragraph (and its mini-markup parse) once and hand out shallow copies,
+# since ReportLab mutates flowable geometry during wrap.
+_STATIC_PARAS: Dict[Tuple[str, int], Paragraph] = {}
+
+
+def _static_para(text: str, style: ParagraphStyle) -> Paragraph:
+    key = (text, id(style))
+    p = _STATIC_PARAS.get(key)
+    if p is None:
+        p = _STATIC_PARAS[key] = Paragraph(text, style)
+    return copy.copy(p)
+
+
+_NUL_TRANS = str.maketrans("", "", "\x00")
+_ELLIPSIS = "…"
 
 
 def _safe_text(v: Any, max_len: int = 400) -> str:
     if v is None:
         return ""
-    s = str(v)
-    s = s.replace("\x00", "").strip()
-    if len(s) > max_len:
-        s = s[: max_len - 1] + "…"
-    return s
+    s = v if isinstance(v, str) else str(v)
+    # Fast path for the typical cell — short, no NULs, no edge whitespace —
+    # which covers numbers, hashes, and most metadata values as-is.
+    if len(s) <= max_len and "\x00" not in s and s == s.strip():
+        return s
+    s = s.translate(_NUL_TRANS).strip()
+    return s if len(s) <= max_len else s[: max_len - 1] + _ELLIPSIS
 
 
 def _as_dict(maybe: Any) -> Dict[str, Any]:
@@ -37,6 +86,13 @@ def _as_dict(maybe: Any) -> Dict[str, Any]:
     return {}
 
 
+@functools.lru_cache(maxsize=1)
+def _utc_minute_str(minute_key: int) -> str:
+    # The timestamp is minute-resolution, so strftime runs at most once per
+    # minute per worker instead of per report.
+    return datetime.datetime.fromtimestamp(minute_key * 60, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+
 def _hash_result_for_id(result: Dict[str, Any]) -> str:
     payload = {
         "filename": result.get("filename"),
@@ -50,36 +106,27 @@ def _hash_result_for_id(result: Dict[str, Any]) -> str:
         "metadata_consistency": result.get("metadata_consistency"),
         "tools": result.get("tools"),
     }
-    s = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(s.encode("utf-8", errors="replace")).hexdigest()
+    try:
+        # One C-level pass straight to bytes; no separate encode step.
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8", errors="replace")
+    return hashlib.sha256(raw).hexdigest()
 
 
 def _kv_table(data: Dict[str, Any], col_widths: Tuple[float, float] = (2.2 * inch, 4.8 * inch)) -> Table:
-    rows = []
-    for k, v in data.items():
-        rows.append([_safe_text(k, 80), _safe_text(v, 800)])
-    t = Table(rows, colWidths=list(col_widths))
-    t.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("ROWBACKGROUNDS", (0, 0), (-1, -1), [colors.whitesmoke, colors.white]),
-                ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.lightgrey),
-                ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ]
-        )
-    )
+    _st = _safe_text  # LOAD_FAST in the comprehension instead of a global lookup per cell
+    rows = [[_st(k, 80), _st(v, 800)] for k, v in data.items()]
+    # LongTable splits linearly across pages instead of Table's quadratic
+    # algorithm; identical output for the small tables, safe for big ones.
+    t = LongTable(rows, colWidths=list(col_widths), splitByRow=1)
+    t.setStyle(_KV_TABLE_STYLE)
     return t
 
 
 def _bullets(title: str, items: List[str], style_title: ParagraphStyle, style_body: ParagraphStyle) -> List[Any]:
     out: List[Any] = []
-    out.append(Paragraph(_safe_text(title, 120), style_title))
+    out.append(_static_para(_safe_text(title, 120), style_title))
     if items:
         html = "<br/>".join(f"• {_safe_text(x, 300)}" for x in items)
     else:
@@ -88,7 +135,16 @@ def _bullets(title: str, items: List[str], style_title: ParagraphStyle, style_bo
     return out
 
 
-def build_pdf_report(result: Any, out_path: str) -> None:
+def render_pdf_bytes(result: Dict[str, Any]) -> bytes:
+    """Render a report to bytes; picklable entry point for worker processes."""
+    buf = io.BytesIO()
+    build_pdf_report(result, buf)
+    return buf.getvalue()
+
+
+def build_pdf_report(result: Any, out: Any) -> None:
+    # `out` may be a filesystem path or any file-like object (e.g. BytesIO);
+    # SimpleDocTemplate accepts both.
     # ---- Type safety ----
     if isinstance(result, str):
         try:
@@ -98,35 +154,34 @@ def build_pdf_report(result: Any, out_path: str) -> None:
     if not isinstance(result, dict):
         raise ValueError(f"build_pdf_report expected dict, got {type(result)}")
 
-    styles = getSampleStyleSheet()
-    title = ParagraphStyle("ts_title", parent=styles["Heading1"], fontName="Helvetica-Bold", fontSize=18, leading=22, alignment=TA_LEFT)
-    h2 = ParagraphStyle("ts_h2", parent=styles["Heading2"], fontName="Helvetica-Bold", fontSize=12, leading=14, alignment=TA_LEFT)
-    body = ParagraphStyle("ts_body", parent=styles["BodyText"], fontName="Helvetica", fontSize=10, leading=13, alignment=TA_LEFT)
-    small = ParagraphStyle("ts_small", parent=styles["BodyText"], fontName="Helvetica", fontSize=9, leading=12, alignment=TA_LEFT)
+    title = _TITLE_STYLE
+    h2 = _H2_STYLE
+    body = _BODY_STYLE
+    small = _SMALL_STYLE
 
-    doc = SimpleDocTemplate(out_path, pagesize=LETTER, leftMargin=0.8 * inch, rightMargin=0.8 * inch, topMargin=0.8 * inch, bottomMargin=0.8 * inch)
+    doc = SimpleDocTemplate(out, pagesize=LETTER, leftMargin=0.8 * inch, rightMargin=0.8 * inch, topMargin=0.8 * inch, bottomMargin=0.8 * inch)
     story: List[Any] = []
 
-    story.append(Paragraph("TruthStamp — Evidence Provenance Report", title))
-    story.append(Paragraph("Cryptographic proof when available. No guessing.", small))
+    story.append(_static_para("TruthStamp — Evidence Provenance Report", title))
+    story.append(_static_para("Cryptographic proof when available. No guessing.", small))
     story.append(Spacer(1, 0.2 * inch))
 
     # Decision context
     decision_context = (_as_dict(result.get("decision_context")).get("purpose")) or (
         "This report supports financial, legal, or editorial decision-making by separating cryptographically verifiable facts, technical observations, and unknowns."
     )
-    story.append(Paragraph("Decision context", h2))
+    story.append(_static_para("Decision context", h2))
     story.append(Paragraph(_safe_text(decision_context, 600), body))
     story.append(Spacer(1, 0.15 * inch))
 
     # Report ID / integrity
     integrity = _as_dict(result.get("report_integrity"))
-    analyzed_at = integrity.get("timestamp") or integrity.get("analyzed_at") or datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+    analyzed_at = integrity.get("timestamp") or integrity.get("analyzed_at") or _utc_minute_str(int(time.time() // 60))
 
     report_hash = _hash_result_for_id(result)
     report_id = report_hash[:12]
 
-    story.append(Paragraph("Executive summary", h2))
+    story.append(_static_para("Executive summary", h2))
     summary = {
         "Report ID": report_id,
         "Analysis time (UTC)": analyzed_at,
@@ -155,7 +210,7 @@ def build_pdf_report(result: Any, out_path: str) -> None:
     story.append(Spacer(1, 0.18 * inch))
 
     # Layer 1: C2PA
-    story.append(Paragraph("Layer 1 — Cryptographically verifiable facts", h2))
+    story.append(_static_para("Layer 1 — Cryptographically verifiable facts", h2))
     c2pa = _as_dict(result.get("c2pa"))
     c2pa_present = bool(c2pa.get("present"))
     c2pa_kv = {
@@ -168,7 +223,7 @@ def build_pdf_report(result: Any, out_path: str) -> None:
     story.append(Spacer(1, 0.18 * inch))
 
     # Layer 2: Derived observations
-    story.append(Paragraph("Layer 2 — Derived technical observations", h2))
+    story.append(_static_para("Layer 2 — Derived technical observations", h2))
 
     meta = _as_dict(result.get("metadata"))
     completeness = _as_dict(result.get("metadata_completeness"))
@@ -191,7 +246,7 @@ def build_pdf_report(result: Any, out_path: str) -> None:
 
     # Timeline (your API uses derived_timeline)
     timeline = _as_dict(result.get("derived_timeline"))
-    story.append(Paragraph("Derived timeline (from available metadata)", h2))
+    story.append(_static_para("Derived timeline (from available metadata)", h2))
     story.append(
         _kv_table(
             {
@@ -206,12 +261,12 @@ def build_pdf_report(result: Any, out_path: str) -> None:
 
     # Consistency (your API uses metadata_consistency)
     consistency = _as_dict(result.get("metadata_consistency"))
-    story.append(Paragraph("Consistency checks", h2))
+    story.append(_static_para("Consistency checks", h2))
     story.append(_kv_table(consistency if consistency else {"Notes": "No consistency checks available."}))
     story.append(Spacer(1, 0.18 * inch))
 
     # Layer 3: Unknowns & limitations
-    story.append(Paragraph("Layer 3 — Unknowns & limitations", h2))
+    story.append(_static_para("Layer 3 — Unknowns & limitations", h2))
     limitations = result.get("limitations") or [
         "Absence of cryptographic provenance is not evidence of manipulation; it limits verifiability.",
         "Metadata can be missing or altered by common workflows (screenshots, exports, messaging apps, social platforms).",
@@ -221,7 +276,7 @@ def build_pdf_report(result: Any, out_path: str) -> None:
     story.append(Spacer(1, 0.18 * inch))
 
     # What would make verifiable
-    story.append(Paragraph("What would increase verifiability", h2))
+    story.append(_static_para("What would increase verifiability", h2))
     wmv = result.get("what_would_make_verifiable") or [
         "Capture with a C2PA-enabled camera or app",
         "Preserve the original file without re-exporting",
@@ -237,7 +292,7 @@ def build_pdf_report(result: Any, out_path: str) -> None:
         "Analysis timestamp (UTC)": analyzed_at,
         "Tool versions": _safe_text(tools, 1200),
     }
-    story.append(Paragraph("Report integrity", h2))
+    story.append(_static_para("Report integrity", h2))
     story.append(_kv_table(integrity_kv))
 
     doc.build(story)
@@ -1,13 +1,15 @@
 import hashlib
 import subprocess
-from typing import Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 
 def sha256_file(path: str) -> str:
-    h = hashlib.sha256()
+    # file_digest (3.11+) reads in large blocks, releases the GIL, and lets
+    # OpenSSL use hardware SHA extensions where available.
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 def run_cmd(cmd: list[str], timeout: int = 30) -> Tuple[int, str, str]:
     try:
@@ -29,3 +31,34 @@ def which(name: str) -> bool:
 
 def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode('utf-8', errors='replace')).hexdigest()
+
+
+class TTLCache:
+    """Tiny thread-safe TTL + LRU cache; stdlib only. None values are not cached."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if not item:
+                return None
+            ts, val = item
+            if time.monotonic() - ts > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return val
+
+    def put(self, key: Any, value: Any) -> None:
+        if value is None:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
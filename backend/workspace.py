@@ -1,26 +1,118 @@
 from __future__ import annotations
 
+import atexit
 import os
+import re
+import secrets
 import sqlite3
 import json
-import uuid
-import datetime
+import threading
+import time
+import zlib
 from typing import Any, Dict, List, Optional, Tuple
 
 DEFAULT_DB_PATH = os.getenv("TRUTHSTAMP_DB_PATH", "/tmp/truthstamp.db")
 
+# One canonical encoder for everything persisted as JSON: sorted keys and
+# compact separators keep stored bytes stable (and hashable) across writers,
+# and a single instance skips per-call encoder setup. check_circular=False
+# is safe because these payloads originate from JSON-parsed/model-dumped data.
+_CANON = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(",", ":"), check_circular=False)
+
+
+def _encode_analysis(analysis: Dict[str, Any]) -> bytes:
+    # EXIF-heavy analysis dicts compress ~5x; smaller rows mean fewer SQLite
+    # pages touched per read/write. SQLite columns are dynamically typed, so
+    # the TEXT-declared column stores the blob fine.
+    return zlib.compress(_CANON.encode(analysis).encode("utf-8"), 6)
+
+
+def _decode_analysis(raw: Any) -> Dict[str, Any]:
+    if not raw:
+        return {}
+    if isinstance(raw, bytes):
+        # Rows written before compression landed may be plain UTF-8 bytes.
+        try:
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            pass
+        raw = raw.decode("utf-8", errors="replace")
+    try:
+        obj = json.loads(raw)
+        return obj if isinstance(obj, dict) else {}
+    except (ValueError, TypeError):
+        return {}
+
 
 def _utc_now_iso() -> str:
-    return datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    # time.gmtime + %-formatting skips datetime object construction and the
+    # strftime format parser; this runs once per row written.
+    t = time.gmtime()
+    return "%04d-%02d-%02dT%02d:%02d:%02dZ" % (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
+
+
+def _utc_now_us() -> int:
+    # Epoch microseconds for ordering: an 8-byte integer compare and a much
+    # smaller index entry than the ~20-byte ISO string (kept for display).
+    return time.time_ns() // 1000
 
 
 def get_db_path() -> str:
     return os.getenv("TRUTHSTAMP_DB_PATH", DEFAULT_DB_PATH)
 
 
+# One connection per thread per db path, created lazily and kept for the
+# process lifetime: sqlite3.connect pays for a file open and page-cache
+# warmup that dwarfs the single-row queries issued here. Keyed by path so
+# a TRUTHSTAMP_DB_PATH change (tests) gets a fresh connection.
+_TLS = threading.local()
+_ALL_CONS: List[sqlite3.Connection] = []
+_ALL_CONS_LOCK = threading.Lock()
+
+
+def _close_all_connections() -> None:
+    with _ALL_CONS_LOCK:
+        for con in _ALL_CONS:
+            try:
+                con.close()
+            except sqlite3.Error:
+                pass
+        _ALL_CONS.clear()
+
+
+atexit.register(_close_all_connections)
+
+
 def connect() -> sqlite3.Connection:
-    con = sqlite3.connect(get_db_path(), check_same_thread=False)
+    path = get_db_path()
+    cons: Dict[str, sqlite3.Connection] = getattr(_TLS, "cons", None) or {}
+    if not hasattr(_TLS, "cons"):
+        _TLS.cons = cons
+    con = cons.get(path)
+    if con is not None:
+        return con
+
+    # cached_statements keeps prepared statements alive across calls, so
+    # the repeated module-literal queries skip re-parse/re-plan.
+    con = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
     con.row_factory = sqlite3.Row
+    # WAL avoids writers blocking readers and cuts per-commit fsync cost;
+    # synchronous=NORMAL is safe with WAL (worst case loses the last commit,
+    # never corrupts). journal_mode sticks to the DB file, the rest are
+    # per-connection, so set them all on first open.
+    try:
+        con.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA cache_size=-20000;"
+        )
+    except sqlite3.DatabaseError:
+        pass
+    cons[path] = con
+    with _ALL_CONS_LOCK:
+        _ALL_CONS.append(con)
     return con
 
 
@@ -49,6 +141,7 @@ def init_db() -> None:
             title TEXT NOT NULL,
             description TEXT,
             created_at TEXT NOT NULL,
+            created_at_us INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY(user_id) REFERENCES users(id)
         );
         """
@@ -68,6 +161,7 @@ def init_db() -> None:
             summary TEXT,
             analysis_json TEXT,
             created_at TEXT NOT NULL,
+            created_at_us INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY(case_id) REFERENCES cases(id)
         );
         """
@@ -86,6 +180,7 @@ def init_db() -> None:
             user_agent TEXT,
             details_json TEXT,
             created_at TEXT NOT NULL,
+            created_at_us INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY(case_id) REFERENCES cases(id),
             FOREIGN KEY(evidence_id) REFERENCES evidence(id)
         );
@@ -97,6 +192,23 @@ def init_db() -> None:
         rows = con.execute(f"PRAGMA table_info({table});").fetchall()
         return any(r[1] == col for r in rows)
 
+    # Integer epoch ordering column for tables that existed before it.
+    for table in ("cases", "evidence", "events"):
+        if not _col_exists(table, "created_at_us"):
+            con.execute(f"ALTER TABLE {table} ADD COLUMN created_at_us INTEGER NOT NULL DEFAULT 0;")
+
+    # Hot-path lookups are "WHERE case_id = ? ORDER BY created_at_us DESC
+    # LIMIT ?"; these composite indexes turn that into a range scan that
+    # yields rows already in order instead of a full scan plus sort. The
+    # epoch column keeps index entries at 8 bytes vs ~20 for the ISO text.
+    con.execute("DROP INDEX IF EXISTS ix_evidence_case_created;")
+    con.execute("DROP INDEX IF EXISTS ix_events_case_created;")
+    con.execute("DROP INDEX IF EXISTS ix_cases_user_created;")
+    con.execute("CREATE INDEX IF NOT EXISTS ix_evidence_case_created_us ON evidence(case_id, created_at_us DESC);")
+    con.execute("CREATE INDEX IF NOT EXISTS ix_events_case_created_us ON events(case_id, created_at_us DESC);")
+    con.execute("CREATE INDEX IF NOT EXISTS ix_events_evidence ON events(evidence_id);")
+    con.execute("CREATE INDEX IF NOT EXISTS ix_cases_user_created_us ON cases(user_id, created_at_us DESC);")
+
     # cases.user_id might be missing in older DB
     if not _col_exists("cases", "user_id"):
         # If the table existed without user_id, add it nullable then backfill to 'public' user.
@@ -114,11 +226,17 @@ def init_db() -> None:
         con.commit()
 
     con.commit()
-    con.close()
 
 
 def _new_id(prefix: str) -> str:
-    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+    # Same 16 random hex chars as uuid4().hex[:16], minus the UUID object
+    # that was built only to be sliced.
+    return f"{prefix}_{secrets.token_hex(8)}"
+
+
+def new_evidence_id() -> str:
+    """Pre-allocate an evidence id so callers can respond before the row lands."""
+    return _new_id("evd")
 
 
 # -----------------------------
@@ -134,7 +252,6 @@ def create_user(email: str, password_hash: str) -> Dict[str, Any]:
         (user_id, email.lower().strip(), password_hash, created_at),
     )
     con.commit()
-    con.close()
     return {"id": user_id, "email": email.lower().strip(), "created_at": created_at}
 
 
@@ -145,7 +262,6 @@ def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
         "SELECT id, email, password_hash, created_at FROM users WHERE email = ?",
         (email.lower().strip(),),
     ).fetchone()
-    con.close()
     return dict(row) if row else None
 
 
@@ -156,7 +272,6 @@ def get_user(user_id: str) -> Optional[Dict[str, Any]]:
         "SELECT id, email, created_at FROM users WHERE id = ?",
         (user_id,),
     ).fetchone()
-    con.close()
     return dict(row) if row else None
 
 
@@ -169,11 +284,10 @@ def create_case(user_id: str, title: str, description: Optional[str] = None) ->
     case_id = _new_id("case")
     created_at = _utc_now_iso()
     con.execute(
-        "INSERT INTO cases (id, user_id, title, description, created_at) VALUES (?, ?, ?, ?, ?)",
-        (case_id, user_id, title, description, created_at),
+        "INSERT INTO cases (id, user_id, title, description, created_at, created_at_us) VALUES (?, ?, ?, ?, ?, ?)",
+        (case_id, user_id, title, description, created_at, _utc_now_us()),
     )
     con.commit()
-    con.close()
     return {"id": case_id, "user_id": user_id, "title": title, "description": description, "created_at": created_at}
 
 
@@ -181,10 +295,9 @@ def list_cases(user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str,
     init_db()
     con = connect()
     rows = con.execute(
-        "SELECT id, user_id, title, description, created_at FROM cases WHERE user_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+        "SELECT id, user_id, title, description, created_at FROM cases WHERE user_id = ? ORDER BY created_at_us DESC, created_at DESC LIMIT ? OFFSET ?",
         (user_id, limit, offset),
     ).fetchall()
-    con.close()
     return [dict(r) for r in rows]
 
 
@@ -195,13 +308,70 @@ def get_case(user_id: str, case_id: str) -> Optional[Dict[str, Any]]:
         "SELECT id, user_id, title, description, created_at FROM cases WHERE id = ? AND user_id = ?",
         (case_id, user_id),
     ).fetchone()
-    con.close()
     return dict(row) if row else None
 
 
 # -----------------------------
 # Evidence
 # -----------------------------
+_EVIDENCE_INSERT_SQL = (
+    "INSERT INTO evidence (id, case_id, filename, sha256, media_type, bytes, provenance_state, summary, analysis_json, created_at, created_at_us) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_EVENT_INSERT_SQL = (
+    "INSERT INTO events (id, case_id, evidence_id, event_type, actor, ip, user_agent, details_json, created_at, created_at_us) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def add_evidence_bulk(case_id: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert many evidence rows in one transaction (one WAL flush for all).
+
+    Each item uses the add_evidence keyword names; ids/timestamps are filled
+    in when absent. Returns the stored rows without analysis_json.
+    """
+    init_db()
+    con = connect()
+    created_at = _utc_now_iso()
+    created_at_us = _utc_now_us()
+    out: List[Dict[str, Any]] = []
+    rows: List[Tuple] = []
+    for it in items:
+        evidence_id = it.get("evidence_id") or _new_id("evd")
+        rows.append(
+            (
+                evidence_id,
+                case_id,
+                it.get("filename") or "upload",
+                it.get("sha256") or "",
+                it.get("media_type"),
+                it.get("nbytes") or 0,
+                it.get("provenance_state"),
+                it.get("summary"),
+                _encode_analysis(it.get("analysis") or {}),
+                created_at,
+                created_at_us,
+            )
+        )
+        out.append(
+            {
+                "id": evidence_id,
+                "case_id": case_id,
+                "filename": it.get("filename") or "upload",
+                "sha256": it.get("sha256") or "",
+                "media_type": it.get("media_type"),
+                "bytes": it.get("nbytes") or 0,
+                "provenance_state": it.get("provenance_state"),
+                "summary": it.get("summary"),
+                "created_at": created_at,
+            }
+        )
+    with con:
+        con.executemany(_EVIDENCE_INSERT_SQL, rows)
+    return out
+
+
 def add_evidence(
     case_id: str,
     filename: str,
@@ -211,18 +381,57 @@ def add_evidence(
     provenance_state: Optional[str],
     summary: Optional[str],
     analysis: Dict[str, Any],
+    evidence_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    return add_evidence_bulk(
+        case_id,
+        [
+            {
+                "filename": filename,
+                "sha256": sha256,
+                "media_type": media_type,
+                "nbytes": nbytes,
+                "provenance_state": provenance_state,
+                "summary": summary,
+                "analysis": analysis,
+                "evidence_id": evidence_id,
+            }
+        ],
+    )[0]
+
+
+def add_evidence_with_event(
+    case_id: str,
+    filename: str,
+    sha256: str,
+    media_type: Optional[str],
+    nbytes: int,
+    provenance_state: Optional[str],
+    summary: Optional[str],
+    analysis: Dict[str, Any],
+    event_type: str,
+    actor: Optional[str] = None,
+    ip: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None,
+    evidence_id: Optional[str] = None,
 ) -> Dict[str, Any]:
+    """Insert an evidence row plus its event in one transaction (one fsync)."""
     init_db()
     con = connect()
-    evidence_id = _new_id("evd")
+    evidence_id = evidence_id or _new_id("evd")
+    event_id = _new_id("evt")
     created_at = _utc_now_iso()
-    con.execute(
-        "INSERT INTO evidence (id, case_id, filename, sha256, media_type, bytes, provenance_state, summary, analysis_json, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (evidence_id, case_id, filename, sha256, media_type, nbytes, provenance_state, summary, json.dumps(analysis), created_at),
-    )
-    con.commit()
-    con.close()
+    created_at_us = _utc_now_us()
+    with con:
+        con.execute(
+            _EVIDENCE_INSERT_SQL,
+            (evidence_id, case_id, filename, sha256, media_type, nbytes, provenance_state, summary, _encode_analysis(analysis), created_at, created_at_us),
+        )
+        con.execute(
+            _EVENT_INSERT_SQL,
+            (event_id, case_id, evidence_id, event_type, actor, ip, user_agent, _CANON.encode(details or {}), created_at, created_at_us),
+        )
     return {
         "id": evidence_id,
         "case_id": case_id,
@@ -236,40 +445,77 @@ def add_evidence(
     }
 
 
+# Two projections: listings and status polls never need the multi-KB
+# analysis blob, so only the full-detail path reads it off disk.
+_EVIDENCE_META_COLS = "id, case_id, filename, sha256, media_type, bytes, provenance_state, summary, created_at"
+_EVIDENCE_FULL_COLS = _EVIDENCE_META_COLS + ", analysis_json"
+
+
 def list_evidence(case_id: str, limit: int = 200) -> List[Dict[str, Any]]:
     init_db()
     con = connect()
     rows = con.execute(
-        "SELECT id, case_id, filename, sha256, media_type, bytes, provenance_state, summary, created_at "
-        "FROM evidence WHERE case_id = ? ORDER BY created_at DESC LIMIT ?",
+        f"SELECT {_EVIDENCE_META_COLS} FROM evidence WHERE case_id = ? ORDER BY created_at_us DESC, created_at DESC LIMIT ?",
         (case_id, limit),
     ).fetchall()
-    con.close()
     return [dict(r) for r in rows]
 
 
+def get_evidence_meta(case_id: str, evidence_id: str) -> Optional[Dict[str, Any]]:
+    """Single-row lookup without the analysis payload (cheap status checks)."""
+    init_db()
+    con = connect()
+    row = con.execute(
+        f"SELECT {_EVIDENCE_META_COLS} FROM evidence WHERE case_id = ? AND id = ?",
+        (case_id, evidence_id),
+    ).fetchone()
+    return dict(row) if row else None
+
+
 def get_evidence(case_id: str, evidence_id: str) -> Optional[Dict[str, Any]]:
     init_db()
     con = connect()
     row = con.execute(
-        "SELECT id, case_id, filename, sha256, media_type, bytes, provenance_state, summary, analysis_json, created_at "
-        "FROM evidence WHERE case_id = ? AND id = ?",
+        f"SELECT {_EVIDENCE_FULL_COLS} FROM evidence WHERE case_id = ? AND id = ?",
         (case_id, evidence_id),
     ).fetchone()
-    con.close()
     if not row:
         return None
     d = dict(row)
-    try:
-        d["analysis"] = json.loads(d.pop("analysis_json") or "{}")
-    except Exception:
-        d["analysis"] = {}
+    d["analysis"] = _decode_analysis(d.pop("analysis_json"))
     return d
 
 
 # -----------------------------
 # Events
 # -----------------------------
+def add_events_bulk(case_id: str, events: List[Dict[str, Any]]) -> List[str]:
+    """Insert many events in one transaction; returns the new event ids."""
+    init_db()
+    con = connect()
+    created_at = _utc_now_iso()
+    created_at_us = _utc_now_us()
+    ids = [_new_id("evt") for _ in events]
+    rows = [
+        (
+            event_id,
+            case_id,
+            ev.get("evidence_id"),
+            ev["event_type"],
+            ev.get("actor"),
+            ev.get("ip"),
+            ev.get("user_agent"),
+            _CANON.encode(ev.get("details") or {}),
+            created_at,
+            created_at_us,
+        )
+        for event_id, ev in zip(ids, events)
+    ]
+    with con:
+        con.executemany(_EVENT_INSERT_SQL, rows)
+    return ids
+
+
 def add_event(
     case_id: str,
     event_type: str,
@@ -279,18 +525,20 @@ def add_event(
     user_agent: Optional[str] = None,
     details: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    init_db()
-    con = connect()
-    event_id = _new_id("evt")
     created_at = _utc_now_iso()
-    payload = json.dumps(details or {})
-    con.execute(
-        "INSERT INTO events (id, case_id, evidence_id, event_type, actor, ip, user_agent, details_json, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (event_id, case_id, evidence_id, event_type, actor, ip, user_agent, payload, created_at),
-    )
-    con.commit()
-    con.close()
+    event_id = add_events_bulk(
+        case_id,
+        [
+            {
+                "event_type": event_type,
+                "evidence_id": evidence_id,
+                "actor": actor,
+                "ip": ip,
+                "user_agent": user_agent,
+                "details": details,
+            }
+        ],
+    )[0]
     return {"id": event_id, "case_id": case_id, "evidence_id": evidence_id, "event_type": event_type, "created_at": created_at}
 
 
@@ -299,10 +547,9 @@ def list_events(case_id: str, limit: int = 200) -> List[Dict[str, Any]]:
     con = connect()
     rows = con.execute(
         "SELECT id, case_id, evidence_id, event_type, actor, ip, user_agent, details_json, created_at "
-        "FROM events WHERE case_id = ? ORDER BY created_at DESC LIMIT ?",
+        "FROM events WHERE case_id = ? ORDER BY created_at_us DESC, created_at DESC LIMIT ?",
         (case_id, limit),
     ).fetchall()
-    con.close()
     out: List[Dict[str, Any]] = []
     for r in rows:
         d = dict(r)
@@ -312,3 +559,27 @@ def list_events(case_id: str, limit: int = 200) -> List[Dict[str, Any]]:
             d["details"] = {}
         out.append(d)
     return out
+
+
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def list_events_summary(case_id: str, fields: List[str], limit: int = 200) -> List[Dict[str, Any]]:
+    """List events with only the named detail fields, extracted in SQL.
+
+    json_extract pulls the requested keys out of details_json inside
+    SQLite's C JSON parser, so Python never loads or dict-ifies the full
+    details blob per row.
+    """
+    for f in fields:
+        if not _IDENT_RE.match(f):
+            raise ValueError(f"invalid detail field name: {f!r}")
+    init_db()
+    con = connect()
+    extracts = "".join(f", json_extract(details_json, '$.{f}') AS {f}" for f in fields)
+    rows = con.execute(
+        f"SELECT id, case_id, evidence_id, event_type, actor, created_at{extracts} "
+        "FROM events WHERE case_id = ? ORDER BY created_at_us DESC, created_at DESC LIMIT ?",
+        (case_id, limit),
+    ).fetchall()
+    return [dict(r) for r in rows]